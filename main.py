@@ -1,15 +1,19 @@
-import xml.etree.ElementTree as ET
 import polib
+import io
 import re
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import concurrent.futures
 import shutil
 import requests
-from rapidfuzz import fuzz, utils as fuzzy_utils
+from rapidfuzz import fuzz, process, utils as fuzzy_utils
 from bs4 import BeautifulSoup  # 用于处理HTML标签转义
 import argparse
 import os
+import sys
+import functools
+import bisect
+import math
 
 
 try:
@@ -17,11 +21,68 @@ try:
 except ImportError:
     print("\033[93mtorch库未安装，无法使用GPU加速。使用CPU进行处理。\033[0m")
 
+try:
+    from lxml import etree as ET  # 基于libxml2的C解析器
+
+    XML_PARSER_OPTIONS = {"remove_blank_text": True}  # 丢弃无意义的空白节点
+except ImportError:
+    print("\033[93mlxml库未安装，使用标准库解析XML。\033[0m")
+    import xml.etree.ElementTree as ET
+
+    XML_PARSER_OPTIONS = {}
+
+
+def normalize_for_matching(content: str) -> str:
+    """归一化空白字符，忽略XML缩进和换行带来的差异"""
+    # 常见情况：只含单个ASCII空格（不含换行、制表符等），无需拆分重组
+    if "  " not in content and content.isprintable():
+        return content.strip()
+    return " ".join(content.split())
+
+
+def _codeblock_repl(match: re.Match) -> str:
+    """单语言代码块，保留原始缩进"""
+    lang = match.group(1) or "gdscript"
+    content = match.group(2)
+    return f"```{lang}\n{content}\n```"
+
+
+def _codeblocks_repl(match: re.Match) -> str:
+    """多语言代码块，拆分为GDScript和C#两个代码块"""
+    gdscript = match.group(1).strip()
+    csharp = match.group(2).strip()
+    return f"```gdscript\n{gdscript}\n```\n\n```csharp\n{csharp}\n```"
+
+
+def _convert_inline(text: str) -> str:
+    """转换内联BBCode标签和引用标签"""
+    return XMLToMarkdownTranslator._INLINE_RE.sub(_inline_repl, text)
+
+
+def _inline_repl(match: re.Match) -> str:
+    """按命中的分支输出Markdown，标签内部的嵌套标签递归转换"""
+    if tag := match.group("tag"):
+        before, after = XMLToMarkdownTranslator._INLINE_WRAPS[tag]
+        return before + _convert_inline(match.group("body")) + after
+    if match.group("br"):
+        return "\n"
+    if (href := match.group("href")) is not None:
+        return f"[{_convert_inline(match.group('link'))}]({href})"
+    if (url := match.group("url")) is not None:
+        return _convert_inline(url)
+    if (param := match.group("param")) is not None:
+        return f"`{param}`"
+    # 引用标签只保留最后一段名称，如 [member Node.name] -> `name`
+    return f"`{match.group('ref').rpartition('.')[2]}`"
+
 
 class XMLToMarkdownTranslator:
     # 可配置参数
     SKIP_FILES = {}  # 跳过文件列表
     SIMILARITY_THRESHOLD = 0.7  # 相似度匹配阈值
+    IO_WORKERS = 4  # 写出文件的线程数
+    CACHE_SIZE = 65536  # 翻译/转换结果缓存条目上限
+    CACHE_MAX_TEXT_LEN = 4096  # 超过该长度的文本不缓存，避免占用过多内存
     DOCS_URL = "https://docs.godotengine.org/zh-cn/4.x"  # 文档链接前缀
     LOCALIZED_STRINGS = {
         "class_header": "# {class_name}\n",
@@ -52,9 +113,77 @@ class XMLToMarkdownTranslator:
         "error": "\033[91m{message}\033[0m",  # 红色错误
     }
 
+    # 类的直接子元素在输出文档中的顺序
+    SECTION_ORDER = (
+        "brief_description",
+        "description",
+        "tutorials",
+        "members",
+        "methods",
+        "constants",
+        "signals",
+    )
+
+    # 预编译的BBCode正则表达式
+    _CODEBLOCK_RE = re.compile(
+        r'\[codeblock(?: lang="([^"]+)")?\](.*?)\[/codeblock\]', re.DOTALL
+    )
+    _CODEBLOCKS_RE = re.compile(
+        r"\[codeblocks\]\s*\[gdscript\](.*?)\[/gdscript\].*?\[csharp\](.*?)\[/csharp\].*?\[/codeblocks\]",
+        re.DOTALL,
+    )
+    # 引用标签（不翻译）
+    REF_TAGS = (
+        "class",
+        "method",
+        "constant",
+        "signal",
+        "member",
+        "enum",
+        "annotation",
+        "constructor",
+        "operator",
+        "theme_item",
+    )
+    # 内联标签和引用标签合并为一个正则，一次扫描完成转换（见 _inline_repl）
+    _INLINE_RE = re.compile(
+        r"\[(?P<tag>b|i|u|s|code|kbd|center)\](?P<body>.*?)\[/(?P=tag)\]"
+        r"|(?P<br>\[br\])"  # 换行符
+        r"|\[url=(?P<href>.*?)\](?P<link>.*?)\[/url\]"  # 超链接
+        r"|\[url\](?P<url>.*?)\[/url\]"  # 纯URL
+        r"|\[param (?P<param>.*?)\]"  # 参数
+        r"|\[(?:" + "|".join(REF_TAGS) + r") (?P<ref>[^\]]+)\]"  # 引用
+    )
+    _INLINE_WRAPS = {
+        "b": ("**", "**"),  # 加粗
+        "i": ("*", "*"),  # 斜体
+        "u": ("<u>", "</u>"),  # 下划线
+        "s": ("~~", "~~"),  # 删除线
+        "code": ("`", "`"),  # 内联代码
+        "kbd": ("`", "`"),  # 键盘输入
+        "center": ("<center>", "</center>"),  # 居中
+    }
+
+    # 格式修正：冒号移到整段强调标记（如 "***"）之后；$DOCS_URL 在同一次扫描中展开
+    _FORMAT_FIX_RE = re.compile(r":(?P<stars>\*+)|：\*\*|\$DOCS_URL")
+
+    # html.parser 会当作标签、注释或声明解析的 "<" 开头，以及实体引用的 "&"
+    # （html.unescape 对未知实体和缺少分号的实体处理与 html.parser 不同）
+    _HTML_TAG_RE = re.compile(r"<[A-Za-z!?/]|&")
+
+    # 单字符替换表
+    _STRIP_NL = str.maketrans("", "", "\n\r")  # 删除换行符
+    _ANGLE_TO_SQUARE = str.maketrans("<>", "[]")  # 尖括号转为方括号
+
     def __init__(
         self, po_file_path: Optional[str] = None, lang_code: Optional[str] = None
     ):
+        # 模板不会变化，预先绑定各自的 str.format
+        self._tmpl = {
+            key: template.format for key, template in self.LOCALIZED_STRINGS.items()
+        }
+        # 复用同一个会话，保持HTTP连接
+        self._session = requests.Session()
         if po_file_path is None and lang_code is not None:
             po_file_path = self.download_po_file(lang_code)
 
@@ -63,8 +192,16 @@ class XMLToMarkdownTranslator:
             self.translation_dict = self._build_translation_dict()
         else:
             self.translation_dict = {}
+            self._normalized_dict = {}
+            self._canonical_dict = {}
+            self._processed_sources = []
+            self._source_lengths = []
+            self._translations = []
+
+        self._setup_caches()
 
         self.class_hierarchy = {}
+        self._path_cache = {}
         self.processed_files = set()
         try:
             self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
@@ -77,12 +214,11 @@ class XMLToMarkdownTranslator:
         local_path = f"godot-engine-godot-class-reference-{lang_code}.po"
 
         print(f"正在下载翻译文件: {url}")
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-
-        with open(local_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        with self._session.get(url, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True  # 按Content-Encoding解压
+            with open(local_path, "wb") as f:
+                shutil.copyfileobj(response.raw, f, length=64 * 1024)
 
         return local_path
 
@@ -91,15 +227,76 @@ class XMLToMarkdownTranslator:
         trans_dict = {}
         for entry in self.po:
             if entry.msgstr:
-                trans_dict[entry.msgid] = entry.msgstr
-                # 添加去除前后空格的版本
-                trans_dict[entry.msgid.strip()] = entry.msgstr.strip()
+                # 驻留原文和较短的译文，重复的短字符串只保留一份
+                msgid = sys.intern(entry.msgid)
+                stripped = entry.msgid.strip()
+                if msgid == stripped:
+                    # 原文没有前后空格时只存一份，沿用去除空格后的译文
+                    trans_dict[msgid] = self._intern_short(entry.msgstr.strip())
+                    continue
+                trans_dict[msgid] = self._intern_short(entry.msgstr)
+                # 添加去除前后空格的版本，不覆盖同名的原文条目
+                trans_dict.setdefault(
+                    sys.intern(stripped), self._intern_short(entry.msgstr.strip())
+                )
+
+        # 归一化空白后的原文索引，保留第一个出现的译文
+        self._normalized_dict = {}
+        for src, trans in trans_dict.items():
+            self._normalized_dict.setdefault(normalize_for_matching(src), trans)
+
+        # 预处理（忽略大小写和标点）后相同的原文归为一类，命中时相似度必为100%
+        self._canonical_dict = {}
+        for src, trans in trans_dict.items():
+            self._canonical_dict.setdefault(fuzzy_utils.default_process(src), trans)
+
+        # 相似度搜索只需比较每一类的代表原文，避免每次翻译时重复预处理；
+        # 按长度排序，以便相似度搜索时用二分查找截取候选范围
+        processed = sorted(self._canonical_dict.items(), key=lambda item: len(item[0]))
+        self._processed_sources = [src for src, _ in processed]
+        self._source_lengths = [len(src) for src in self._processed_sources]
+        self._translations = [trans for _, trans in processed]
         return trans_dict
 
+    def _setup_caches(self):
+        """缓存短文本的转换和翻译结果（包括未匹配时的原文结果）"""
+        self._convert_bbcode_to_markdown = self._memoize(
+            self._convert_bbcode_to_markdown
+        )
+        self._translate_text = self._memoize(self._translate_text)
+
+    def __getstate__(self):
+        """序列化时只保留构建好的翻译索引，不包含原始PO对象、HTTP会话和缓存包装"""
+        state = self.__dict__.copy()
+        for key in ("po", "_session", "_convert_bbcode_to_markdown", "_translate_text"):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._setup_caches()
+
+    def _memoize(self, func):
+        """用LRU缓存包装文本处理函数，过长的文本直接计算"""
+        cached = functools.lru_cache(maxsize=self.CACHE_SIZE)(func)
+
+        @functools.wraps(func)
+        def wrapper(text: str) -> str:
+            if text and len(text) > self.CACHE_MAX_TEXT_LEN:
+                return func(text)
+            return cached(text)
+
+        return wrapper
+
+    @staticmethod
+    def _intern_short(text: str) -> str:
+        """驻留短字符串（类型名、常用短语等），长文本保持原样"""
+        return sys.intern(text) if len(text) < 64 else text
+
     def _localize(self, key: str, **kwargs) -> str:
         """本地化字符串，处理缺失参数"""
         try:
-            return self.LOCALIZED_STRINGS[key].format(**kwargs)
+            return self._tmpl[key](**kwargs)
         except KeyError as e:
             # 如果缺少参数，尝试不格式化直接返回
             print(self._localize("warning", message=f"本地化字符串缺少参数 {e}: {key}"))
@@ -111,125 +308,124 @@ class XMLToMarkdownTranslator:
             return text
 
         # 先处理代码块以保留缩进
-        def handle_codeblock(match):
-            lang = match.group(1) or "gdscript"
-            content = match.group(2)
-            # 保留原始缩进
-            return f"```{lang}\n{content}\n```"
-
-        text = re.sub(
-            r'\[codeblock(?: lang="([^"]+)")?\](.*?)\[/codeblock\]',
-            handle_codeblock,
-            text,
-            flags=re.DOTALL,
-        )
+        text = self._CODEBLOCK_RE.sub(_codeblock_repl, text)
 
         # 2. 处理多语言代码块
-        def handle_codeblocks(match):
-            gdscript = match.group(1).strip()
-            csharp = match.group(2).strip()
-            return f"```gdscript\n{gdscript}\n```\n\n```csharp\n{csharp}\n```"
-
-        text = re.sub(
-            r"\[codeblocks\]\s*\[gdscript\](.*?)\[/gdscript\].*?\[csharp\](.*?)\[/csharp\].*?\[/codeblocks\]",
-            handle_codeblocks,
-            text,
-            flags=re.DOTALL,
-        )
+        text = self._CODEBLOCKS_RE.sub(_codeblocks_repl, text)
 
-        # 3. 处理内联标签
-        replacements = [
-            (r"\[b\](.*?)\[/b\]", r"**\1**"),  # 加粗
-            (r"\[i\](.*?)\[/i\]", r"*\1*"),  # 斜体
-            (r"\[u\](.*?)\[/u\]", r"<u>\1</u>"),  # 下划线
-            (r"\[s\](.*?)\[/s\]", r"~~\1~~"),  # 删除线
-            (r"\[code\](.*?)\[/code\]", r"`\1`"),  # 内联代码
-            (r"\[kbd\](.*?)\[/kbd\]", r"`\1`"),  # 键盘输入
-            (r"\[br\]", "\n"),  # 换行符
-            (r"\[center\](.*?)\[/center\]", r"<center>\1</center>"),  # 居中
-            (r"\[url=(.*?)\](.*?)\[/url\]", r"[\2](\1)"),  # 超链接
-            (r"\[url\](.*?)\[/url\]", r"\1"),  # 纯URL
-            (r"\[param (.*?)\]", r"`\1`"),  # 参数
-        ]
-
-        for pattern, repl in replacements:
-            text = re.sub(pattern, repl, text)
-
-        # 4. 处理引用标签（不翻译）
-        ref_tags = [
-            "class",
-            "method",
-            "constant",
-            "signal",
-            "member",
-            "enum",
-            "annotation",
-            "constructor",
-            "operator",
-            "theme_item",
-        ]
-        for tag in ref_tags:
-            text = re.sub(
-                rf"\[{tag} ([^\]]+)\]", lambda m: f"`{m.group(1).split('.')[-1]}`", text
-            )
+        # 3. 处理内联标签和引用标签（引用不翻译）
+        text = _convert_inline(text)
 
-        text = (
-            text.replace(":**", "**:")
-            .replace(":*", "*:")
-            .replace("：**", "**：")
-            .replace("*：", "*：")
-            .replace("$DOCS_URL", self.DOCS_URL)
-        )  # 修复格式
+        # 修复格式
+        text = self._FORMAT_FIX_RE.sub(self._format_fix_repl, text)
 
-        # 转义HTML标签
-        text = BeautifulSoup(text, "html.parser").text
-        text = text.replace("<", "[").replace(">", "]")
+        # 转义HTML标签：只有疑似包含HTML标签或实体时才交给BeautifulSoup，其余文本原样保留。
+        # 纯空白文本也必须交给它：BeautifulSoup 会把整段空白改写为单个换行
+        # （含换行时）或单个空格，跳过这一步会改变输出
+        if text.isspace() or self._HTML_TAG_RE.search(text):
+            text = BeautifulSoup(text, "html.parser").text
+        text = text.translate(self._ANGLE_TO_SQUARE)
 
         return text
 
+    def _format_fix_repl(self, match: re.Match) -> str:
+        """格式修正的替换回调"""
+        if stars := match.group("stars"):
+            return stars + ":"
+        if match.group(0) == "$DOCS_URL":
+            return self.DOCS_URL
+        return "**："
+
     def _translate_text(self, text: str) -> str:
         """翻译文本，使用更快的相似度算法"""
         if not text or not self.translation_dict:
             return self._convert_bbcode_to_markdown(text)
 
-        # 使用RapidFuzz进行快速相似度匹配
-        best_match = None
-        best_score = 0
+        # 原文完全一致时直接使用译文，无需相似度搜索
+        if (translation := self.translation_dict.get(text)) is not None:
+            return self._convert_bbcode_to_markdown(translation)
 
-        # 预处理文本
-        processed_text = fuzzy_utils.default_process(text)
+        # 仅缩进或换行不同（如XML中的多行描述）时同样视为完全一致
+        normalized_text = normalize_for_matching(text)
+        if (translation := self._normalized_dict.get(normalized_text)) is not None:
+            return self._convert_bbcode_to_markdown(translation)
 
-        for src, trans in self.translation_dict.items():
-            score = fuzz.ratio(
-                processed_text, fuzzy_utils.default_process(src), processor=None
+        # 预处理后完全一致，直接查表，无需相似度搜索
+        processed_text = fuzzy_utils.default_process(text)
+        if (translation := self._canonical_dict.get(processed_text)) is not None:
+            return self._convert_bbcode_to_markdown(translation)
+
+        # fuzz.ratio 不超过 2*min(a,b)/(a+b)，长度相差过大的候选不可能达到阈值；
+        # 阈值不大于0时任何候选都可能命中，不做裁剪
+        if self.SIMILARITY_THRESHOLD > 0:
+            length_ratio = self.SIMILARITY_THRESHOLD / (2 - self.SIMILARITY_THRESHOLD)
+            lo = bisect.bisect_left(
+                self._source_lengths, int(len(processed_text) * length_ratio)
+            )
+            hi = bisect.bisect_right(
+                self._source_lengths, math.ceil(len(processed_text) / length_ratio)
             )
-            if score > best_score:
-                best_score = score
-                best_match = trans
-                if score == 100:  # 完全匹配
-                    break
+        else:
+            lo, hi = 0, len(self._source_lengths)
+
+        # 使用RapidFuzz在C层完成整个相似度搜索
+        match = process.extractOne(
+            processed_text,
+            self._processed_sources[lo:hi],
+            scorer=fuzz.ratio,
+            processor=None,
+            score_cutoff=self.SIMILARITY_THRESHOLD * 100,
+        )
 
-        if best_match and best_score >= self.SIMILARITY_THRESHOLD * 100:
+        if match:
+            _, best_score, index = match
+            index += lo
             if best_score < 100:
                 print(f"\033[93m相似度匹配 ({best_score}%): {text[:50]}...\033[0m")
-            return self._convert_bbcode_to_markdown(best_match)
+            return self._convert_bbcode_to_markdown(self._translations[index])
 
         return self._convert_bbcode_to_markdown(text)
 
 
-    def _get_deprecation_notice(self, elem: ET.Element) -> Optional[str]:
-        """获取弃用/实验性说明"""
+    def _get_status(self, elem: ET.Element) -> Tuple[str, Optional[str]]:
+        """获取弃用/实验性标记及其原始说明，每个属性只读取一次"""
         if deprecated := elem.get("deprecated"):
-            return self._convert_bbcode_to_markdown(deprecated)
+            return "⚠️", deprecated
         if experimental := elem.get("experimental"):
-            return self._convert_bbcode_to_markdown(experimental)
-        return None
+            return "🔬", experimental
+        return "", None
+
+    def _get_deprecation_notice(self, elem: ET.Element) -> Optional[str]:
+        """获取弃用/实验性说明"""
+        _, notice = self._get_status(elem)
+        return self._convert_bbcode_to_markdown(notice) if notice else None
 
     def _process_xml_file(self, xml_file: Path) -> Optional[Dict]:
-        """处理单个XML文件，返回处理结果和类信息"""
+        """处理单个XML文件，返回处理结果和类信息
+
+        使用iterparse流式解析：类的每个直接子元素（简要描述、方法列表等）
+        解析完毕后立即渲染为Markdown并清空，不在内存中保留整棵树。
+        """
+        root = None
+        sections = {}
+        depth = 0
         try:
-            tree = ET.parse(xml_file)
-            root = tree.getroot()
+            for event, elem in ET.iterparse(
+                str(xml_file), events=("start", "end"), **XML_PARSER_OPTIONS
+            ):
+                if event == "start":
+                    if root is None:
+                        root = elem
+                    depth += 1
+                    continue
+
+                depth -= 1
+                if depth == 1:
+                    self._render_section(elem, sections)
+                    # 清空已渲染的元素，并从根节点删除之前已处理的兄弟节点，
+                    # 避免根节点下堆积空元素（当前元素仍由解析器引用，暂不删除）
+                    elem.clear()
+                    del root[:-1]
         except ET.ParseError as e:
             print(
                 self._localize(
@@ -245,7 +441,7 @@ class XMLToMarkdownTranslator:
         self.class_hierarchy[class_name] = inherits
 
         # 构建Markdown内容
-        md_content = self.xml_to_markdown(root)
+        md_content = self._assemble_markdown(root, sections)
 
         return {
             "class_name": class_name,
@@ -256,211 +452,262 @@ class XMLToMarkdownTranslator:
 
     def xml_to_markdown(self, root: ET.Element) -> str:
         """将XML元素转换为Markdown文档"""
-        md_lines = []
+        sections = {}
+        for child in root:
+            self._render_section(child, sections)
+        return self._assemble_markdown(root, sections)
+
+    def _render_section(self, elem: ET.Element, sections: Dict[str, str]):
+        """渲染类的一个直接子元素，结果存入sections（同名元素只取第一个）"""
+        if elem.tag in self.SECTION_ORDER and elem.tag not in sections:
+            sections[elem.tag] = getattr(self, f"_render_{elem.tag}")(elem)
+
+    def _assemble_markdown(self, root: ET.Element, sections: Dict[str, str]) -> str:
+        """按固定顺序拼接类头部和各部分内容"""
+        buf = io.StringIO()
+        buf.write(self._render_header(root))
+        for tag in self.SECTION_ORDER:
+            buf.write(sections.get(tag, ""))
+        return buf.getvalue()
+
+    # 以下渲染函数逐行写入 io.StringIO，每行以换行符结尾
+
+    def _render_header(self, root: ET.Element) -> str:
+        buf = io.StringIO()
 
         # 1. 类名标题
         class_name = root.get("name", "Class")
-        md_lines.append(self._localize("class_header", class_name=class_name))
+        buf.write(self._localize("class_header", class_name=class_name))
+        buf.write("\n")
 
         # 2. 继承信息
         inherits = root.get("inherits")
         if inherits:
-            emoji = (
-                "⚠️"
-                if root.get("deprecated")
-                else "🔬"
-                if root.get("experimental")
-                else ""
-            )
-            info = (
-                self._translate_text(root.get("deprecated"))
-                if emoji == "⚠️"
-                else self._translate_text(root.get("experimental"))
-                if emoji == "🔬"
-                else "None"
-            )
-            md_lines.append(
+            emoji, notice = self._get_status(root)
+            info = self._translate_text(notice) if notice else "None"
+            buf.write(
                 self._localize(
                     "inherits_from", inherits=inherits, emoji=emoji, info=info
                 )
             )
+            buf.write("\n")
 
         # 3. 版本信息
         if version := root.get("version"):
-            md_lines.append(self._localize("version", version=version))
+            buf.write(self._localize("version", version=version))
+            buf.write("\n")
+
+        return buf.getvalue()
 
+    def _render_brief_description(self, brief: ET.Element) -> str:
         # 4. 简要描述
-        if (brief := root.find("brief_description")) is not None and brief.text:
-            translated = self._translate_text(brief.text)
-            md_lines.append(self._localize("brief_description", content=translated))
+        if not (text := (brief.text or "").strip()):
+            return ""
+        translated = self._translate_text(text)
+        return self._localize("brief_description", content=translated) + "\n"
 
+    def _render_description(self, desc: ET.Element) -> str:
         # 5. 详细描述
-        if (desc := root.find("description")) is not None and desc.text:
-            translated = self._translate_text(desc.text)
-            md_lines.append(self._localize("description", content=translated))
+        if not (text := (desc.text or "").strip()):
+            return ""
+        translated = self._translate_text(text)
+        return self._localize("description", content=translated) + "\n"
 
+    def _render_tutorials(self, tutorials: ET.Element) -> str:
         # 6. 教程链接
-        if (tutorials := root.find("tutorials")) is not None and len(tutorials) > 0:
-            md_lines.append(self._localize("tutorials"))
-            for link in tutorials.findall("link"):
-                title = self._translate_text(link.get("title", "教程链接"))
-                url = link.text.replace("$DOCS_URL", self.DOCS_URL)
-                md_lines.append(self._localize("tutorial_item", title=title, url=url))
-            md_lines.append("")
-
+        if len(tutorials) == 0:
+            return ""
+        buf = io.StringIO()
+        buf.write(self._localize("tutorials"))
+        buf.write("\n")
+        for link in tutorials.iterfind("link"):
+            title = self._translate_text(link.get("title", "教程链接"))
+            url = link.text.replace("$DOCS_URL", self.DOCS_URL)
+            buf.write(self._localize("tutorial_item", title=title, url=url))
+            buf.write("\n")
+        buf.write("\n")
+        return buf.getvalue()
+
+    def _render_members(self, members: ET.Element) -> str:
         # 7. 成员变量表格
-        if (members := root.find("members")) is not None and len(members) > 0:
-            md_lines.append(self._localize("members"))
-            md_lines.append(self._localize("members_table"))
-            for member in members.findall("member"):
-                name = member.get("name", "")
-                type_ = member.get("type", "")
-                desc = self._translate_text(member.text if member.text else "")
-
-                row = self._localize(
+        if len(members) == 0:
+            return ""
+        buf = io.StringIO()
+        buf.write(self._localize("members"))
+        buf.write("\n")
+        buf.write(self._localize("members_table"))
+        buf.write("\n")
+        for member in members.iterfind("member"):
+            name = member.get("name", "")
+            type_ = member.get("type", "")
+            text = (member.text or "").strip()
+            desc = self._translate_text(text) if text else ""
+
+            buf.write(
+                self._localize(
                     "member_row",
-                    name=name.replace("\n", "").replace("\r", ""),
-                    type_=type_.replace("\n", "").replace("\r", ""),
-                    desc=desc.replace("\n", "").replace("\r", ""),
+                    name=name.translate(self._STRIP_NL),
+                    type_=type_.translate(self._STRIP_NL),
+                    desc=desc.translate(self._STRIP_NL),
                 )
-                if notice := self._get_deprecation_notice(member):
-                    row += self._localize("deprecation_notice", notice=notice)
-                md_lines.append(row + " |")
-            md_lines.append("")
+            )
+            if notice := self._get_deprecation_notice(member):
+                buf.write(self._localize("deprecation_notice", notice=notice))
+            buf.write(" |\n")
+        buf.write("\n")
+        return buf.getvalue()
 
+    def _render_methods(self, methods: ET.Element) -> str:
         # 8. 方法文档
-        if (methods := root.find("methods")) is not None and len(methods) > 0:
-            md_lines.append(self._localize("methods"))
-            for method in methods.findall("method"):
-                name = method.get("name", "")
-                md_lines.append(self._localize("method_header", name=name))
-
-                if notice := self._get_deprecation_notice(method):
-                    md_lines[-1] += " ⚠️"
-                    md_lines.append(self._localize("deprecation_notice", notice=notice))
+        if len(methods) == 0:
+            return ""
+        buf = io.StringIO()
+        buf.write(self._localize("methods"))
+        buf.write("\n")
+        for method in methods.iterfind("method"):
+            name = method.get("name", "")
+            buf.write(self._localize("method_header", name=name))
+
+            if notice := self._get_deprecation_notice(method):
+                buf.write(" ⚠️\n")
+                buf.write(self._localize("deprecation_notice", notice=notice))
+                buf.write("\n")
+            else:
+                buf.write("\n\n")
+
+            # 返回类型
+            if (return_type := method.find("return")) is not None:
+                type_ = return_type.get("type", "void")
+                if enum := return_type.get("enum"):
+                    buf.write(
+                        self._localize("return_type_enum", type_=type_, enum=enum)
+                    )
+                    buf.write("\n")
                 else:
-                    md_lines.append("")
-
-                # 返回类型
-                if (return_type := method.find("return")) is not None:
-                    type_ = return_type.get("type", "void")
-                    if enum := return_type.get("enum"):
-                        md_lines.append(
-                            self._localize("return_type_enum", type_=type_, enum=enum)
-                        )
-                    else:
-                        md_lines.append(
-                            self._localize("return_type", type_=type_) + "  \n"
-                        )
-
-                # 参数列表
-                if (args := method.findall("argument")) and len(args) > 0:
-                    md_lines.append(self._localize("parameters"))
-                    for arg in args:
-                        param = self._localize(
+                    buf.write(self._localize("return_type", type_=type_))
+                    buf.write("  \n\n")
+
+            # 参数列表
+            if (args := method.findall("argument")) and len(args) > 0:
+                buf.write(self._localize("parameters"))
+                buf.write("\n")
+                for arg in args:
+                    buf.write(
+                        self._localize(
                             "parameter",
                             index=arg.get("index", ""),
                             name=arg.get("name", ""),
                             type_=arg.get("type", ""),
                         )
-                        if (default := arg.get("default")) is not None:
-                            param += self._localize(
-                                "parameter_default", default=default
-                            )
-                        md_lines.append(param)
-
-                # 方法描述
-                if (
-                    method_desc := method.find("description")
-                ) is not None and method_desc.text:
-                    translated = self._translate_text(method_desc.text)
-                    md_lines.append("\n" + translated + "\n")
-
-        # 9. 常量和信号
-        for section, title_key in [("constants", "constants"), ("signals", "signals")]:
-            if (elem := root.find(section)) is not None and len(elem) > 0:
-                md_lines.append(self._localize(title_key))
-                for item in elem.findall("*"):
-                    name = item.get("name", "")
-                    if section == "constants":
-                        value = item.get("value", "")
-                        line = f"- **`{name}`** = `{value}`"
-                    else:
-                        line = f"- **`{name}`**"
-
-                    if notice := self._get_deprecation_notice(item):
-                        line += " ⚠️"
-                        line += self._localize("deprecation_notice", notice=notice)
-
-                    line += (
-                        f"  \n{self._translate_text(item.text if item.text else '')}\n"
                     )
-                    md_lines.append(line)
-
-        return "\n".join(md_lines)
+                    if (default := arg.get("default")) is not None:
+                        buf.write(self._localize("parameter_default", default=default))
+                    buf.write("\n")
+
+            # 方法描述
+            if text := method.findtext("description", "").strip():
+                translated = self._translate_text(text)
+                buf.write("\n")
+                buf.write(translated)
+                buf.write("\n\n")
+        return buf.getvalue()
+
+    def _render_constants(self, constants: ET.Element) -> str:
+        # 9. 常量
+        return self._render_items(constants)
+
+    def _render_signals(self, signals: ET.Element) -> str:
+        # 10. 信号
+        return self._render_items(signals)
+
+    def _render_items(self, elem: ET.Element) -> str:
+        """渲染常量或信号列表"""
+        if len(elem) == 0:
+            return ""
+        section = elem.tag
+        buf = io.StringIO()
+        buf.write(self._localize(section))
+        buf.write("\n")
+        for item in elem.iterfind("*"):
+            name = item.get("name", "")
+            if section == "constants":
+                value = item.get("value", "")
+                buf.write(f"- **`{name}`** = `{value}`")
+            else:
+                buf.write(f"- **`{name}`**")
+
+            if notice := self._get_deprecation_notice(item):
+                buf.write(" ⚠️")
+                buf.write(self._localize("deprecation_notice", notice=notice))
+
+            buf.write("  \n")
+            if text := (item.text or "").strip():
+                buf.write(self._translate_text(text))
+            buf.write("\n\n")
+        return buf.getvalue()
+
+    def _hierarchy_path(self, class_name: str) -> Path:
+        """类文件相对输出目录的路径，由继承链上的父类组成；父类的结果缓存复用"""
+        if (path := self._path_cache.get(class_name)) is not None:
+            return path
+        parent = self.class_hierarchy.get(class_name)
+        if parent and parent in self.class_hierarchy:
+            path = self._hierarchy_path(parent) / parent
+        else:
+            path = Path()
+        self._path_cache[class_name] = path
+        return path
 
-    def _organize_by_hierarchy(self, output_dir: Path):
-        """根据继承关系组织文件结构"""
+    def _organize_by_hierarchy(self, output_dir: Path, contents: Dict[str, str]):
+        """根据继承关系组织文件结构，每个文件直接写入最终位置"""
         print("\n正在根据继承关系组织文件结构...")
-        temp_dir = output_dir / "_temp"
-        temp_dir.mkdir(exist_ok=True)
-
-        # 先移动所有文件到临时目录
-        for md_file in output_dir.glob("*.md"):
-            if md_file.name not in self.SKIP_FILES:
-                shutil.move(str(md_file), str(temp_dir / md_file.name))
-
-        # 创建目录结构并移动文件
-        for class_name, inherits in self.class_hierarchy.items():
-            md_file = temp_dir / f"{class_name}.md"
-            if not md_file.exists():
-                continue
-
-            target_dir = output_dir
-            if inherits:
-                # 查找继承链上的所有父类
-                parent_class = inherits
-                inheritance_chain = []
-                while parent_class and parent_class in self.class_hierarchy:
-                    inheritance_chain.append(parent_class)
-                    parent_class = self.class_hierarchy[parent_class]
-
-                # 创建完整的继承路径
-                if inheritance_chain:
-                    target_dir = output_dir / "/".join(reversed(inheritance_chain))
+        self._path_cache = {}
+        created_dirs = {Path()}  # 输出目录本身已存在
+
+        # 文件写入交给少量I/O线程，系统调用等待期间不阻塞主线程
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.IO_WORKERS
+        ) as writer:
+            writes = []
+            for class_name, inherits in self.class_hierarchy.items():
+                content = contents.get(class_name)
+                if content is None:
+                    continue
+
+                # 创建完整的继承路径（每个目录只创建一次）
+                hierarchy_path = self._hierarchy_path(class_name)
+                target_dir = output_dir / hierarchy_path
+                if hierarchy_path not in created_dirs:
                     target_dir.mkdir(parents=True, exist_ok=True)
+                    created_dirs.add(hierarchy_path)
 
-                # 添加父类链接到文件第二行
                 if inherits:
-                    with open(md_file, "r+", encoding="utf-8") as f:
-                        content = f.readlines()
-                        # 确保有至少一行（标题）
-                        if len(content) > 0:
-                            # 计算相对路径
-                            rel_path = f"{inherits}.md"
-                            if inherits in self.class_hierarchy:
-                                rel_path = "../" + f"{inherits}.md"
-
-                            # 构建父类链接行
-                            parent_link = self._localize(
-                                "inherits_from_2", rel_path=rel_path, inherits=inherits
-                            )
-
-                            # 覆写第二+1行（如果内容少于2行则追加）
-                            if len(content) >= 2:
-                                content[2] = parent_link
-                            else:
-                                content.append(parent_link)
-
-                            # 回写文件
-                            f.seek(0)
-                            f.writelines(content)
-                            f.truncate()
-
-            shutil.move(str(md_file), str(target_dir / md_file.name))
-
-        # 清理临时目录
-        shutil.rmtree(temp_dir)
+                    # 计算相对路径
+                    rel_path = f"{inherits}.md"
+                    if inherits in self.class_hierarchy:
+                        rel_path = "../" + f"{inherits}.md"
+
+                    # 构建父类链接行
+                    parent_link = self._localize(
+                        "inherits_from_2", rel_path=rel_path, inherits=inherits
+                    )
+
+                    # 覆写第二+1行（如果内容少于2行则追加）
+                    lines = content.splitlines(keepends=True)
+                    if len(lines) > 2:
+                        lines[2] = parent_link
+                    else:
+                        lines.append(parent_link)
+                    content = "".join(lines)
+
+                output_path = target_dir / f"{class_name}.md"
+                future = writer.submit(output_path.write_text, content, "utf-8")
+                writes.append((output_path, future))
+
+            for output_path, future in writes:
+                future.result()
+                print(f"\n成功生成: {output_path}")
+
         print("文件结构组织完成")
 
     def process_directory(self, xml_dir: str, output_dir: str):
@@ -469,65 +716,104 @@ class XMLToMarkdownTranslator:
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # 使用多线程处理文件
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = []
-            for xml_file in sorted(xml_dir.glob("*.xml")):
-                if xml_file.name in self.SKIP_FILES:
-                    print(
-                        self._localize("warning", message=f"跳过文件: {xml_file.name}")
-                    )
+        # 单次扫描目录，按文件名排序
+        xml_files = []
+        with os.scandir(xml_dir) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if not entry.name.endswith(".xml") or not entry.is_file():
                     continue
-                futures.append(executor.submit(self._process_xml_file, xml_file))
-
-            for future in concurrent.futures.as_completed(futures):
-                result = future.result()
+                if entry.name in self.SKIP_FILES:
+                    print(self._localize("warning", message=f"跳过文件: {entry.name}"))
+                    continue
+                xml_files.append(Path(entry.path))
+
+        # 使用多进程处理文件，工作进程共享主进程已构建的翻译器
+        contents = {}
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(self,),
+        ) as executor:
+            for result in executor.map(
+                _process_xml_file_in_worker, xml_files, chunksize=8
+            ):
                 if not result:
                     continue
 
-                output_path = output_dir / f"{result['class_name']}.md"
-                output_path.write_text(result["content"], encoding="utf-8")
-                print(f"\n成功生成: {output_path}")
+                # 继承关系记录在工作进程中，需要同步回主进程
+                self.class_hierarchy[result["class_name"]] = result["inherits"]
+                contents[result["class_name"]] = result["content"]
                 self.processed_files.add(result["class_name"])
 
-        # 二次处理：根据继承关系组织文件
-        self._organize_by_hierarchy(output_dir)
+        # 继承关系完整后，按继承结构一次性写出所有文件
+        self._organize_by_hierarchy(output_dir, contents)
+
+
+# 工作进程中的翻译器实例，由 _init_worker 设置
+_worker_translator: Optional[XMLToMarkdownTranslator] = None
+
+
+def _init_worker(translator: XMLToMarkdownTranslator):
+    """工作进程初始化：直接使用主进程构建好的翻译器
+
+    fork 启动时翻译器随进程内存写时复制共享；spawn 启动时每个工作进程
+    只反序列化一次，都无需重新解析PO文件。
+    """
+    global _worker_translator
+    _worker_translator = translator
+
+
+def _process_xml_file_in_worker(xml_file: Path) -> Optional[Dict]:
+    """在工作进程中处理单个XML文件"""
+    return _worker_translator._process_xml_file(xml_file)
+
+
+_WS_RE = re.compile(r'\s+')
+
 
 def generate_context_with_descriptions(self: XMLToMarkdownTranslator,directory):
     output_lines = []
+    # 标题模式只需本地化、编译一次
+    brief_re = re.compile(self._localize('brief_description_2') + r'\s*$')
     
     def process_directory(path, prefix=''):
-        entries = sorted(os.listdir(path))
+        # scandir 返回的条目自带类型信息，无需再逐个 stat
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda e: e.name)
         for i, entry in enumerate(entries):
-            full_path = os.path.join(path, entry)
             is_last = i == len(entries) - 1
             
-            if os.path.isdir(full_path):
-                line = prefix + ('└── ' if is_last else '├─ ') + entry
+            if entry.is_dir():
+                line = prefix + ('└── ' if is_last else '├─ ') + entry.name
                 output_lines.append(line)
                 new_prefix = prefix + (' ' if is_last else '│ ')
-                process_directory(full_path, new_prefix)
+                process_directory(entry.path, new_prefix)
             else:
-                line = prefix + ('└── ' if is_last else '├─ ') + entry
+                line = prefix + ('└── ' if is_last else '├─ ') + entry.name
                 output_lines.append(line)
                 
                 # Check for corresponding .md file
-                if entry.lower().endswith('.md'):
-                    md_path = full_path
+                if entry.name.lower().endswith('.md'):
+                    md_path = entry.path
+                    md_exists = entry.is_file()  # 失效的符号链接为 False
                 else:
-                    md_path = os.path.splitext(full_path)[0] + '.md'
+                    md_path = os.path.splitext(entry.path)[0] + '.md'
+                    md_exists = os.path.exists(md_path)
                 
                 description = ''
-                if os.path.exists(md_path):
+                if md_exists:
                     with open(md_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        # Find the "## 简要描述" section
-                        match = re.search(XMLToMarkdownTranslator._localize(self=self,key='brief_description_2')+r'\s*\n+(.*?)(?=\n|\Z)', content, re.DOTALL)
-                        if match:
-                            description = match.group(1).strip()
-                            # Clean up the description
-                            description = re.sub(r'\s+', ' ', description)  # Replace multiple spaces/newlines
-                            description = description[:18]+"..." if len(description) > 18 else description  # Limit to 18 characters
+                        # 逐行读取，找到 "## 简要描述" 后取第一个非空行即停止
+                        lines = iter(f)
+                        for text in lines:
+                            if brief_re.match(text):
+                                for text in lines:
+                                    if text.strip():
+                                        # Clean up the description
+                                        description = _WS_RE.sub(' ', text.strip())  # Replace multiple spaces
+                                        description = description[:18]+"..." if len(description) > 18 else description  # Limit to 18 characters
+                                        break
+                                break
                 
                 if description:
                     output_lines[-1]=output_lines[-1]+': '+description
@@ -538,13 +824,6 @@ def generate_context_with_descriptions(self: XMLToMarkdownTranslator,directory):
     # Write to context.txt
     with open(os.path.join(directory, 'context.txt'), 'w', encoding='utf-8') as f:
         f.write('\n'.join(output_lines))
-    
-    output_lines.append('.')
-    process_directory(directory)
-    
-    # Write to context.txt
-    with open(os.path.join(directory, 'context.txt'), 'w', encoding='utf-8') as f:
-        f.write('\n'.join(output_lines))
 
 def main():
     parser = argparse.ArgumentParser(